@@ -17,15 +17,30 @@
 # --- End Guide ---
 
 import argparse
+import atexit
+import contextlib
+import ctypes
+import hashlib
 import logging
+import math
+import mmap
+import operator
 import os
 import re
 import html
+import io
 import json
 import requests
+from requests.adapters import HTTPAdapter
+import sqlite3
 import subprocess
+import threading
 import time
 import sys
+import functools
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from array import array
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
@@ -38,6 +53,16 @@ except ImportError:
     print("ERROR: The 'psutil' library is required. Please run 'pip install psutil'.")
     sys.exit(1)
 
+# Optional: orjson encodes/decodes the Ollama JSON bodies faster than the stdlib.
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+
 # =========================
 # Configuration
 # =========================
@@ -116,31 +141,151 @@ Corrected sentence:
 """
 
     FORBIDDEN_CHARS_RE: re.Pattern = re.compile(r'[>:|“”"‘’]')
+    # Same characters as FORBIDDEN_CHARS_RE, replaced with spaces via str.translate.
+    FORBIDDEN_CHARS_TABLE: dict = field(default_factory=lambda: str.maketrans(dict.fromkeys('>:|“”"‘’', ' ')))
     DOC_META_PATTERNS: List[re.Pattern] = field(init=False)
     TRAILING_STOPWORDS: Set[str] = field(default_factory=lambda: set("and or to for with in of on at by from into via as that which including such as than then while when where".split()))
+    # Imperative openers that mark a draft as well-formed enough to skip the grammar validator.
+    VERB_STARTERS: Set[str] = field(default_factory=lambda: set("learn configure deploy install manage set use understand explore discover create enable disable troubleshoot monitor secure find get access review upgrade migrate integrate define customize build run add remove update check protect optimize automate plan prepare register apply implement maintain control connect store back restore replicate scale provision administer perform track view identify resolve select compare".split()))
     TITLE_RE: re.Pattern = re.compile(r"^\s*=\s+.+")
     DESC_RE: re.Pattern = re.compile(r"^:\s*description\s*:\s*", re.IGNORECASE)
+    # Matched against the raw file bytes, so files that are skipped are never decoded.
+    XML_DESC_RE: re.Pattern = re.compile(rb'<meta\s+name="description"[^>]*?(?:/>|>(?:(.*?)</meta>)?)', re.IGNORECASE | re.DOTALL)
+    # Also covers guide navigation files such as nav-admin-guide.adoc.
     NAV_GENERIC_RE: re.Pattern = re.compile(r"^nav(?:-.+)?\.adoc$", re.IGNORECASE)
-    NAV_GUIDE_RE: re.Pattern = re.compile(r"^nav-.+-guide\.adoc$", re.IGNORECASE)
+    # Leaked prompt instructions, removed case-insensitively in one pass before any other cleanup.
+    LEAKAGE_RE: re.Pattern = field(init=False)
+    SPACE_COLLAPSE_RE: re.Pattern = re.compile(r"\s+")
+    POSSESSIVE_RE: re.Pattern = re.compile(r"(\w+)'s\b")
+    LEADING_PREPOSITION_RE: re.Pattern = re.compile(r"^(by|with|through|using)\s+", re.IGNORECASE)
+    # Prompt templates split around their placeholders, so prompts are built by concatenation instead of str.format.
+    PROMPT_PARTS: tuple = field(init=False)
+    PROMPT_RETRY_PARTS: tuple = field(init=False)
+    PROMPT_VALIDATE_PARTS: tuple = field(init=False)
+    # Template heads with the banned terms already filled in; refreshed by add_banned_terms().
+    PROMPT_HEADS: tuple = field(init=False)
 
     def __post_init__(self):
         self.DOC_META_PATTERNS = [re.compile(p, re.IGNORECASE) for p in [r"^\s*This\s+(guide|page|document|section)\s+(describes|covers|explains|provides)\s+", r"^\s*In\s+this\s+(guide|page|document|section)\s+", r"^\s*The\s+(guide|page|document|section)\s+(describes|covers|explains|provides)\s+"]]
+        leakage_phrases = [
+            "Follow these rules strictly",
+            "Your task is to",
+            "You must now",
+            "Output only",
+            "Critical:",
+            "Important:",
+            "Note:",
+            "Remember:",
+            "Your response must contain only",
+        ]
+        self.LEAKAGE_RE = re.compile("|".join(re.escape(p) for p in sorted(leakage_phrases, key=len, reverse=True)), re.IGNORECASE)
+        self.PROMPT_PARTS = self._split_generation_template(self.PROMPT_TMPL)
+        self.PROMPT_RETRY_PARTS = self._split_generation_template(self.PROMPT_TMPL_RETRY)
+        self.PROMPT_VALIDATE_PARTS = tuple(self.PROMPT_TMPL_VALIDATE.split("{sentence}"))
+        self._bake_banned_terms()
+
+    def add_banned_terms(self, terms) -> None:
+        """Adds terms to BANNED_LITERALS and rebuilds the prompt heads that list them."""
+        self.BANNED_LITERALS.update(terms)
+        self._bake_banned_terms()
+
+    def _bake_banned_terms(self) -> None:
+        # Sorted so the prompt text, and with it every cache key derived from it, is stable across runs.
+        blacklist = ", ".join(sorted(self.BANNED_LITERALS))
+        self.PROMPT_HEADS = tuple(parts[0] + blacklist + parts[1] for parts in (self.PROMPT_PARTS, self.PROMPT_RETRY_PARTS))
+
+    @staticmethod
+    def _split_generation_template(template: str) -> tuple:
+        before, rest = template.split("{blacklist}")
+        between, after = rest.split("{content}")
+        return before, between, after
+
+    def build_prompt(self, content: str, retry: bool = False) -> str:
+        """Fills the generation (or retry) template with the banned terms and page content."""
+        head = self.PROMPT_HEADS[1 if retry else 0]
+        after = self.PROMPT_RETRY_PARTS[2] if retry else self.PROMPT_PARTS[2]
+        return head + content + after
+
+    def build_validate_prompt(self, sentence: str) -> str:
+        """Fills the grammar validation template with the draft sentence."""
+        before, after = self.PROMPT_VALIDATE_PARTS
+        return before + sentence + after
 
 # =========================
 # System Info & HTML Report
 # =========================
 
-def get_system_info():
-    info = {"ollama_version": "Not Found", "gpu_info": "NVIDIA GPU not detected", "ram_total": "N/A"}
+def cache_home() -> Path:
+    """Directory for the script's on-disk caches ($XDG_CACHE_HOME or ~/.cache)."""
+    return Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+
+SYSINFO_CACHE_TTL = 24 * 3600
+
+class _NvmlMemory(ctypes.Structure):
+    _fields_ = [("total", ctypes.c_ulonglong), ("free", ctypes.c_ulonglong), ("used", ctypes.c_ulonglong)]
+
+def _nvml_gpu_info():
+    """Reads GPU names and memory through NVML, in nvidia-smi's CSV format, or returns None."""
+    try:
+        nvml = ctypes.CDLL("libnvidia-ml.so.1")
+    except OSError:
+        return None
+    if nvml.nvmlInit_v2() != 0:
+        return None
+    try:
+        count = ctypes.c_uint()
+        if nvml.nvmlDeviceGetCount_v2(ctypes.byref(count)) != 0:
+            return None
+        gpus = []
+        for i in range(count.value):
+            handle = ctypes.c_void_p()
+            name = ctypes.create_string_buffer(96)
+            memory = _NvmlMemory()
+            if (nvml.nvmlDeviceGetHandleByIndex_v2(i, ctypes.byref(handle)) != 0
+                    or nvml.nvmlDeviceGetName(handle, name, len(name)) != 0
+                    or nvml.nvmlDeviceGetMemoryInfo(handle, ctypes.byref(memory)) != 0):
+                return None
+            gpus.append(f"{name.value.decode()}, {memory.total // 1024**2} MiB")
+        return "\n".join(gpus) or None
+    finally:
+        nvml.nvmlShutdown()
+
+def _cached_ollama_version():
+    """Returns the Ollama version from the sysinfo cache, probing 'ollama --version' at most once a day."""
+    cache_file = cache_home() / "doc-lama-metagen-sysinfo.json"
+    try:
+        cached = json.loads(cache_file.read_text(encoding='utf-8'))
+        if time.time() - cached["ts"] <= SYSINFO_CACHE_TTL:
+            return cached["ollama_version"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
     try:
         result = subprocess.run(['ollama', '--version'], capture_output=True, text=True, check=True)
-        info['ollama_version'] = result.stdout.strip()
     except (FileNotFoundError, subprocess.CalledProcessError):
         logging.warning("Could not determine Ollama version. Is 'ollama' in your system's PATH?")
+        return None
+    version = result.stdout.strip()
     try:
-        result = subprocess.run(['nvidia-smi', '--query-gpu=gpu_name,memory.total', '--format=csv,noheader'], capture_output=True, text=True, check=True)
-        info['gpu_info'] = result.stdout.strip()
-    except (FileNotFoundError, subprocess.CalledProcessError): pass
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        cache_file.write_text(json.dumps({"ts": int(time.time()), "ollama_version": version}), encoding='utf-8')
+    except OSError as e:
+        logging.debug(f"Could not write sysinfo cache {cache_file}: {e}")
+    return version
+
+@functools.lru_cache(maxsize=1)
+def get_system_info():
+    info = {"ollama_version": "Not Found", "gpu_info": "NVIDIA GPU not detected", "ram_total": "N/A"}
+    version = _cached_ollama_version()
+    if version is not None:
+        info['ollama_version'] = version
+    gpu_info = _nvml_gpu_info()
+    if gpu_info is not None:
+        info['gpu_info'] = gpu_info
+    else:
+        try:
+            result = subprocess.run(['nvidia-smi', '--query-gpu=gpu_name,memory.total', '--format=csv,noheader'], capture_output=True, text=True, check=True)
+            info['gpu_info'] = result.stdout.strip()
+        except (FileNotFoundError, subprocess.CalledProcessError): pass
     try:
         mem = psutil.virtual_memory()
         info['ram_total'] = f"{mem.total / (1024**3):.2f} GB"
@@ -148,26 +293,56 @@ def get_system_info():
         logging.warning(f"Could not determine system RAM: {e}")
     return info
 
+_LOG_LOCK = threading.Lock()
+
+# Same output as html.escape(s, quote=True), done in a single C-level pass.
+_HTML_ESCAPE_TABLE = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#x27;'})
+
+def _h(s: str) -> str:
+    return s.translate(_HTML_ESCAPE_TABLE) if s else s
+
+# One row of the HTML report's processing log table.
+_REPORT_ROW_TMPL = """<tr class="border-b border-slate-200 hover:bg-slate-50">
+                    <td class="py-3 px-6 whitespace-nowrap border-l-4 {border}">{timestamp}</td>
+                    <td class="py-3 px-6 font-medium text-slate-700" title="{filepath_escaped}">{filepath_short}</td>
+                    <td class="py-3 px-6 whitespace-nowrap">{type}</td>
+                    <td class="py-3 px-6"><span class="text-white text-xs font-bold mr-2 px-2.5 py-1 rounded-full {bg}">{status}</span></td>
+                    <td class="py-3 px-6 font-mono text-xs text-slate-600 break-words">{details_escaped}</td>
+                </tr>"""
+
+@dataclass
+class LogEntry:
+    """One processed file in the HTML report. Slotted, since large runs keep one per file."""
+    __slots__ = ("timestamp", "filepath", "type", "status", "details")
+    timestamp: str
+    filepath: str
+    type: str
+    status: str
+    details: str
+
 def add_html_log_entry(log_list, file_path, file_type, status, details=""):
     if log_list is None: return
-    log_list.append({"timestamp": datetime.now().strftime('%H:%M:%S'), "filepath": str(file_path), "type": file_type, "status": status, "details": details})
+    entry = LogEntry(datetime.now().strftime('%H:%M:%S'), str(file_path), file_type, status, details)
+    with _LOG_LOCK:
+        log_list.append(entry)
 
-def generate_html_report(output_path, directory, model, duration, files_processed, files_changed, log_entries, system_info, report_title):
+@functools.lru_cache(maxsize=4096)
+def truncate_path(path_str):
+    """Shortens the path to start from the 'doc-<product>' directory."""
+    try:
+        parts = path_str.split(os.path.sep)
+        for i, part in enumerate(parts):
+            if part.startswith('doc-'):
+                return os.path.join(*parts[i:])
+        if len(parts) >= 2:
+            return os.path.join(parts[-2], parts[-1])
+        return path_str
+    except (ValueError, IndexError):
+        return path_str
+
+def generate_html_report(output_path, directory, model, duration, files_processed, files_changed, log_entries, system_info, report_title, cache_stats=None, validation_stats=None):
     logging.info(f"Generating HTML report at {output_path}")
 
-    def truncate_path(path_str):
-        """Shortens the path to start from the 'doc-<product>' directory."""
-        try:
-            parts = path_str.split(os.path.sep)
-            for i, part in enumerate(parts):
-                if part.startswith('doc-'):
-                    return os.path.join(*parts[i:])
-            if len(parts) >= 2:
-                return os.path.join(parts[-2], parts[-1])
-            return path_str
-        except Exception:
-            return path_str
-
     status_styles = {
         "ADDED":    {"bg": "bg-green-500", "border": "border-green-500"},
         "REPLACED": {"bg": "bg-green-500", "border": "border-green-500"},
@@ -184,29 +359,37 @@ def generate_html_report(output_path, directory, model, duration, files_processe
     icon_time = '<svg xmlns="http://www.w3.org/2000/svg" class="h-8 w-8 text-slate-400" fill="none" viewBox="0 0 24 24" stroke="currentColor" stroke-width="2"><path stroke-linecap="round" stroke-linejoin="round" d="M12 8v4l3 3m6-3a9 9 0 11-18 0 9 9 0 0118 0z" /></svg>'
     icon_model = '<svg xmlns="http://www.w3.org/2000/svg" class="h-8 w-8 text-slate-400" fill="none" viewBox="0 0 24 24" stroke="currentColor" stroke-width="2"><path stroke-linecap="round" stroke-linejoin="round" d="M9.75 17L9 20l-1 1h8l-1-1-.75-3M3 13h18M5 17h14a2 2 0 002-2V5a2 2 0 00-2-2H5a2 2 0 00-2 2v10a2 2 0 002 2z" /></svg>'
 
+    cache_line = ""
+    if cache_stats is not None:
+        semantic = f', {cache_stats["semantic_hits"]} similar-page hits' if cache_stats.get("semantic_hits") is not None else ""
+        cache_line = f'<div class="mt-1 text-xs text-slate-400">Cache: {cache_stats["hits"]} hits, {cache_stats["misses"]} misses{semantic}</div>'
+    validation_line = ""
+    if validation_stats is not None:
+        validation_line = f'<div class="mt-1 text-xs text-slate-400">Grammar checks: {validation_stats["run"]} run, {validation_stats["skipped"]} skipped</div>'
+
     try:
         with open(output_path, 'w', encoding='utf-8') as f:
             f.write(f"""<!DOCTYPE html>
 <html lang="en" class="bg-slate-100">
 <head>
     <meta charset="UTF-8">
-    <title>{html.escape(report_title)}: AI Generated Meta Descriptions</title>
+    <title>{_h(report_title)}: AI Generated Meta Descriptions</title>
     <script src="https://cdn.tailwindcss.com"></script>
 </head>
 <body class="font-sans text-slate-800">
     <div class="container mx-auto p-4 sm:p-6 lg:p-8">
         
         <div class="mb-8">
-            <h1 class="text-4xl font-bold text-slate-900">{html.escape(report_title)}</h1>
+            <h1 class="text-4xl font-bold text-slate-900">{_h(report_title)}</h1>
             <p class="text-xl text-slate-600 mt-1">AI Generated Meta Descriptions</p>
             <p class="text-sm text-slate-400 mt-2">Report generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
         </div>
 
         <div class="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-4 gap-6 mb-8">
-            <div class="bg-white p-5 rounded-xl shadow-lg flex items-center justify-between"><div class="info"><div class="text-sm font-medium text-slate-500">Files Processed</div><div class="mt-1 text-3xl font-semibold text-slate-900">{files_processed}</div></div><div class="icon">{icon_files}</div></div>
-            <div class="bg-white p-5 rounded-xl shadow-lg flex items-center justify-between"><div class="info"><div class="text-sm font-medium text-slate-500">Files Changed</div><div class="mt-1 text-3xl font-semibold text-green-600">{files_changed}</div></div><div class="icon">{icon_changes}</div></div>
+            <div class="bg-white p-5 rounded-xl shadow-lg flex items-center justify-between"><div class="info"><div class="text-sm font-medium text-slate-500">Files Processed</div><div class="mt-1 text-3xl font-semibold text-slate-900">{files_processed}</div>{cache_line}</div><div class="icon">{icon_files}</div></div>
+            <div class="bg-white p-5 rounded-xl shadow-lg flex items-center justify-between"><div class="info"><div class="text-sm font-medium text-slate-500">Files Changed</div><div class="mt-1 text-3xl font-semibold text-green-600">{files_changed}</div>{validation_line}</div><div class="icon">{icon_changes}</div></div>
             <div class="bg-white p-5 rounded-xl shadow-lg flex items-center justify-between"><div class="info"><div class="text-sm font-medium text-slate-500">Processing Time</div><div class="mt-1 text-3xl font-semibold text-slate-900">{duration:.2f}s</div></div><div class="icon">{icon_time}</div></div>
-            <div class="bg-white p-5 rounded-xl shadow-lg flex items-center justify-between"><div class="info"><div class="text-sm font-medium text-slate-500">Model Used</div><div class="mt-1 text-2xl font-semibold text-slate-900 truncate">{html.escape(model)}</div></div><div class="icon">{icon_model}</div></div>
+            <div class="bg-white p-5 rounded-xl shadow-lg flex items-center justify-between"><div class="info"><div class="text-sm font-medium text-slate-500">Model Used</div><div class="mt-1 text-2xl font-semibold text-slate-900 truncate">{_h(model)}</div></div><div class="icon">{icon_model}</div></div>
         </div>
 
         <div class="bg-white rounded-xl shadow-lg overflow-hidden">
@@ -229,23 +412,33 @@ def generate_html_report(output_path, directory, model, duration, files_processe
                         </tr>
                     </thead>
                     <tbody class="text-sm">""")
+            # Build all rows in memory and write them at once; styles are looked up once per status.
+            row_styles = {}
+            rows = []
             for entry in log_entries:
-                style = status_styles.get(entry["status"].upper(), default_style)
-                f.write(f"""<tr class="border-b border-slate-200 hover:bg-slate-50">
-                    <td class="py-3 px-6 whitespace-nowrap border-l-4 {style['border']}">{entry["timestamp"]}</td>
-                    <td class="py-3 px-6 font-medium text-slate-700" title="{html.escape(entry["filepath"])}">{truncate_path(entry["filepath"])}</td>
-                    <td class="py-3 px-6 whitespace-nowrap">{entry["type"]}</td>
-                    <td class="py-3 px-6"><span class="text-white text-xs font-bold mr-2 px-2.5 py-1 rounded-full {style['bg']}">{entry["status"]}</span></td>
-                    <td class="py-3 px-6 font-mono text-xs text-slate-600 break-words">{html.escape(str(entry["details"]))}</td>
-                </tr>""")
-            f.write("""</tbody>
+                status = entry.status
+                style = row_styles.get(status)
+                if style is None:
+                    style = row_styles[status] = status_styles.get(status.upper(), default_style)
+                rows.append(_REPORT_ROW_TMPL.format_map({
+                    "border": style['border'],
+                    "bg": style['bg'],
+                    "timestamp": entry.timestamp,
+                    "filepath_escaped": _h(entry.filepath),
+                    "filepath_short": truncate_path(entry.filepath),
+                    "type": entry.type,
+                    "status": status,
+                    "details_escaped": _h(str(entry.details)),
+                }))
+            f.write("".join(rows))
+            f.write(f"""</tbody>
                 </table>
             </div>
         </div>
         
         <div class="mt-8 text-center text-sm text-slate-500">
-            <p>Ollama: {html.escape(system_info['ollama_version'])} &bull; GPU: {html.escape(system_info['gpu_info'])} &bull; System RAM: {html.escape(system_info['ram_total'])}</p>
-            <p class="mt-1">Source Directory: {html.escape(directory)}</p>
+            <p>Ollama: {_h(system_info['ollama_version'])} &bull; GPU: {_h(system_info['gpu_info'])} &bull; System RAM: {_h(system_info['ram_total'])}</p>
+            <p class="mt-1">Source Directory: {_h(directory)}</p>
         </div>
     </div>
     <script>
@@ -293,62 +486,126 @@ def load_brand_config_from_entities(filepath: str) -> List[Dict[str, Any]]:
         return []
     
     brands = []
-    content = Path(filepath).read_text(encoding='utf-8')
-    
-    regex = re.compile(r'<!ENTITY\s+([\w-]+)\s+"([^"]+)">')
-    matches = regex.findall(content)
-    
-    for key, name in matches:
-        family = 'opensuse' if 'opensuse' in name.lower() or 'leap' in name.lower() else 'suse'
-        brands.append({'key': key, 'name': name.strip(), 'family': family})
+    # Scan a read-only memory map so large entities files are never copied into one string.
+    regex = re.compile(rb'<!ENTITY\s+([\w-]+)\s+"([^"]+)">')
+    if os.path.getsize(filepath) > 0:
+        with open(filepath, 'rb') as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for match in regex.finditer(mm):
+                key = match.group(1).decode('utf-8')
+                name = match.group(2).decode('utf-8')
+                name_l = name.lower()
+                family = 'opensuse' if 'opensuse' in name_l or 'leap' in name_l else 'suse'
+                brands.append({'key': key, 'name': name.strip(), 'family': family})
         
     logging.info(f"Loaded {len(brands)} brands from entities file for consistency checking.")
     return brands
 
-def post_process_description(description: str, file_path: str, brands: List[Dict[str, Any]]):
+@functools.lru_cache(maxsize=64)
+def _keyword_patterns(keywords: tuple) -> tuple:
+    """Returns cached, case-insensitive whole-word patterns for the keywords, longest first."""
+    return tuple(re.compile(r'\b' + re.escape(k) + r'\b', re.IGNORECASE) for k in sorted(keywords, key=len, reverse=True))
+
+def remove_keywords(text: str, patterns: tuple) -> str:
+    """Removes the keywords one after another, longest first."""
+    # Not one alternation: with overlapping keywords such as "SUSE Linux" and "Linux Enterprise",
+    # a single pass stops at the first match and leaves part of the longer term behind.
+    for pattern in patterns:
+        text = pattern.sub('', text)
+    return text
+
+class _BrandsKey(tuple):
+    """A tuple that computes its hash once, so the per-file brand cache lookups do not rehash every brand."""
+    def __hash__(self):
+        try:
+            return self._hash
+        except AttributeError:
+            self._hash = tuple.__hash__(self)
+            return self._hash
+
+def build_brands_key(brands: List[Dict[str, Any]]) -> tuple:
+    """Hashable snapshot of the brand list, used to key the per-run brand caches. Build it once per run."""
+    return _BrandsKey((b['key'], b['name'], b['family']) for b in brands)
+
+@functools.lru_cache(maxsize=8)
+def _brand_key_matcher(brands_key: tuple):
+    """Builds one scanner that reports, at every position, the longest brand key matching there."""
+    # Brands are ranked longest key first (stable), and each lowercased key selects its best-ranked brand.
+    order = sorted(range(len(brands_key)), key=lambda i: len(brands_key[i][0]), reverse=True)
+    selected = {}
+    for rank, index in enumerate(order):
+        selected.setdefault(brands_key[index][0].lower(), (rank, index))
+    alternatives = "|".join(re.escape(k) for k in sorted(selected, key=len, reverse=True))
+    # A zero-width lookahead lets finditer report overlapping hits in a single scan.
+    return re.compile(r'(?=\b(' + alternatives + r')\b)', re.IGNORECASE), selected
+
+def _find_file_context(file_path: str, brands: List[Dict[str, Any]], brands_key: tuple = None):
+    """Returns the brand with the longest key found as a whole word in the path."""
+    pattern, selected = _brand_key_matcher(brands_key if brands_key is not None else build_brands_key(brands))
+    best = None
+    for match in pattern.finditer(file_path):
+        hit = selected[match.group(1).lower()]
+        if best is None or hit < best:
+            best = hit
+    return brands[best[1]] if best is not None else None
+
+@functools.lru_cache(maxsize=8)
+def _banned_for_family(family: str, brands_key: tuple):
+    """Returns the removal patterns for every brand name (and its longer words) outside the family, or None."""
+    banned_keywords = set()
+    for _, name, brand_family in brands_key:
+        if brand_family != family:
+            banned_keywords.add(name)
+            for word in name.split():
+                if len(word) > 3:
+                    banned_keywords.add(word)
+    return _keyword_patterns(tuple(sorted(banned_keywords))) if banned_keywords else None
+
+# Gaps left by removed words, collapsed here and in sanitize_and_finalize.
+_MULTI_SPACE_RE = re.compile(r'\s{2,}')
+
+# Dangling grammar cleanup applied after brand keywords are removed.
+_SPACE_COMMA_RE = re.compile(r'(\w+)\s+,')
+_MULTI_COMMA_RE = re.compile(r'(,\s*){2,}')
+_COMMA_CONJ_COMMA_RE = re.compile(r',\s*(and|or)\s*,')
+_DANGLING_END_RE = re.compile(r'\b(and|or|a|the|on|of)\s*$', re.IGNORECASE)
+_PREP_CONJ_RE = re.compile(r'\b(on|of)\s+(and|or)\b', re.IGNORECASE)
+_COMMA_PERIOD_RE = re.compile(r',\s*\.')
+
+def post_process_description(description: str, file_path: str, brands: List[Dict[str, Any]], brands_key: tuple = None):
     """Checks for brand consistency and removes incorrect brand keywords."""
     if not brands:
         return description, None
 
-    file_context = None
-    sorted_brands = sorted(brands, key=lambda b: len(b['key']), reverse=True)
-    for brand in sorted_brands:
-        if re.search(r'\b' + re.escape(brand['key']) + r'\b', file_path, re.IGNORECASE):
-            file_context = brand
-            break
-    
+    if brands_key is None:
+        brands_key = build_brands_key(brands)
+    file_context = _find_file_context(file_path, brands, brands_key)
     if not file_context:
         return description, None
 
-    banned_keywords = set()
-    for brand in brands:
-        if brand['family'] != file_context['family']:
-            banned_keywords.add(brand['name'])
-            for word in brand['name'].split():
-                if len(word) > 3:
-                    banned_keywords.add(word)
-
-    if not banned_keywords:
+    banned_patterns = _banned_for_family(file_context['family'], brands_key)
+    if banned_patterns is None:
         return description, None
 
     original_description = description
-    for keyword in sorted(list(banned_keywords), key=len, reverse=True):
-        pattern = r'\b' + re.escape(keyword) + r'\b'
-        if re.search(pattern, description, re.IGNORECASE):
-            description = re.sub(pattern, '', description, flags=re.IGNORECASE)
+    description = remove_keywords(description, banned_patterns)
 
     if description != original_description:
         logging.warning(f"Correcting brand mismatch in {file_path}.")
-        # More robust cleanup for dangling grammar
-        description = re.sub(r'\s{2,}', ' ', description).strip() # Collapse spaces
-        description = re.sub(r'(\w+)\s+,', r'\1,', description) # Fix space before comma: "word ," -> "word,"
-        description = re.sub(r'(,\s*){2,}', ',', description) # Fix multiple commas: ", ," -> ","
-        description = re.sub(r',\s*(and|or)\s*,', ',', description) # Fix dangling conjunctions between commas
-        description = re.sub(r'\b(and|or|a|the|on|of)\s*$', '', description, flags=re.IGNORECASE) # Dangling conjunctions/articles at the end
-        description = re.sub(r'\b(on|of)\s+(and|or)\b', '', description, flags=re.IGNORECASE) # "on and", "of or"
-        description = re.sub(r',\s*\.', '.', description) # " ,." -> "."
-        description = description.replace(' ,', ',').replace(' .', '.')
-        description = re.sub(r'\s{2,}', ' ', description).strip() # Final space collapse
+        # More robust cleanup for dangling grammar. The passes depend on each other's output, so they
+        # stay in order; the comma fixes are skipped outright when there is no comma to fix.
+        description = _MULTI_SPACE_RE.sub(' ', description).strip() # Collapse spaces
+        has_comma = ',' in description
+        if has_comma:
+            description = _SPACE_COMMA_RE.sub(r'\1,', description) # Fix space before comma: "word ," -> "word,"
+            description = _MULTI_COMMA_RE.sub(',', description) # Fix multiple commas: ", ," -> ","
+            description = _COMMA_CONJ_COMMA_RE.sub(',', description) # Fix dangling conjunctions between commas
+        description = _DANGLING_END_RE.sub('', description) # Dangling conjunctions/articles at the end
+        description = _PREP_CONJ_RE.sub('', description) # "on and", "of or"
+        if has_comma:
+            description = _COMMA_PERIOD_RE.sub('.', description) # " ,." -> "."
+            description = description.replace(' ,', ',')
+        description = description.replace(' .', '.')
+        description = _MULTI_SPACE_RE.sub(' ', description).strip() # Final space collapse
 
         return description.strip(), "UPDATED"
 
@@ -365,15 +622,265 @@ def resolve_entities_in_string(text: str, brands: List[Dict[str, Any]]):
             text = text.replace(entity_ref, brand['name'])
     return text
 
+# One pooled session for all Ollama calls so connections are kept alive between requests.
+_SESSION = requests.Session()
+_SESSION.mount("http://", HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=0))
+_SESSION.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=0))
+_SESSION.headers.update({"Connection": "keep-alive", "Accept-Encoding": "gzip, deflate"})
+atexit.register(_SESSION.close)
+
+# Caps the number of in-flight Ollama requests regardless of how many workers process files.
+_OLLAMA_SLOTS = {"sem": threading.BoundedSemaphore(8)}
+
+# Sent with every request so the model stays loaded between files; None leaves it to the server default.
+_KEEP_ALIVE = "30m"
+_KEEP_ALIVE_SECONDS_RE = re.compile(r"-?\d+")
+
+def set_ollama_concurrency(limit: int):
+    _OLLAMA_SLOTS["sem"] = threading.BoundedSemaphore(limit)
+    # Keep one pooled connection per in-flight request so none are dropped and re-opened.
+    if limit > 16:
+        _SESSION.mount("http://", HTTPAdapter(pool_connections=16, pool_maxsize=limit, max_retries=0))
+        _SESSION.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=limit, max_retries=0))
+
+def set_ollama_keep_alive(keep_alive: str):
+    """Sets the keep_alive sent with every request; an empty value leaves it to the server default."""
+    global _KEEP_ALIVE
+    # Ollama parses a string as a Go duration, which needs a unit ("30m"); bare seconds such as
+    # "-1" or "3600" are only accepted as a JSON number.
+    if _KEEP_ALIVE_SECONDS_RE.fullmatch(keep_alive.strip()):
+        _KEEP_ALIVE = int(keep_alive)
+    else:
+        _KEEP_ALIVE = keep_alive.strip() or None
+
+def _ollama_body(**fields) -> bytes:
+    """Encodes an Ollama request body, adding keep_alive unless it is left to the server default."""
+    if _KEEP_ALIVE is not None:
+        fields["keep_alive"] = _KEEP_ALIVE
+    return _json_dumps(fields)
+
+# On-disk cache of Ollama responses, keyed by sha256(model + prompt). Disabled until init_response_cache() is called.
+_CACHE = {"db": None, "ttl": 0, "hits": 0, "misses": 0}
+_CACHE_LOCK = threading.Lock()
+
+def init_response_cache(db_path: Path, ttl: int = 0):
+    """Opens (or creates) the SQLite response cache. A ttl of 0 means entries never expire."""
+    try:
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(str(db_path), check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, response TEXT, ts INTEGER)")
+        db.commit()
+    except (OSError, sqlite3.Error) as e:
+        logging.warning(f"Could not open response cache at {db_path}: {e}. Continuing without cache.")
+        return
+    _CACHE["db"], _CACHE["ttl"] = db, ttl
+    atexit.register(db.close)
+    logging.info(f"Using Ollama response cache at {db_path}")
+
+def response_cache_stats():
+    """Returns the cache hit counts of this run, or None when the response cache is disabled."""
+    if _CACHE["db"] is None:
+        return None
+    with _CACHE_LOCK:
+        return {"hits": _CACHE["hits"], "misses": _CACHE["misses"], "semantic_hits": _SEMANTIC["hits"] if _SEMANTIC["embed_model"] else None}
+
+def _cache_get(key: str):
+    db = _CACHE["db"]
+    if db is None:
+        return None
+    with _CACHE_LOCK:
+        row = db.execute("SELECT response, ts FROM responses WHERE key = ?", (key,)).fetchone()
+        if row and (not _CACHE["ttl"] or time.time() - row[1] <= _CACHE["ttl"]):
+            _CACHE["hits"] += 1
+            return row[0]
+        _CACHE["misses"] += 1
+    return None
+
+def _cache_put(key: str, response: str):
+    db = _CACHE["db"]
+    if db is None or not response:
+        return
+    with _CACHE_LOCK:
+        try:
+            db.execute("INSERT OR REPLACE INTO responses (key, response, ts) VALUES (?, ?, ?)", (key, response, int(time.time())))
+            db.commit()
+        except sqlite3.Error as e:
+            logging.warning(f"Could not write to response cache: {e}")
+
+# Prompts already answered in this run, and prompts another worker is still waiting on,
+# so identical pages processed side by side cost a single request even with --no-cache.
+_RUN_CACHE = {"responses": {}, "pending": {}}
+_RUN_CACHE_LOCK = threading.Lock()
+
+def _count_cache_hit():
+    if _CACHE["db"] is not None:
+        with _CACHE_LOCK:
+            _CACHE["hits"] += 1
+
 def call_ollama(model: str, prompt: str, base_url: str, timeout=120) -> str:
-    """Calls the Ollama API."""
+    """Calls the Ollama API, serving repeated prompts from this run or the response cache."""
+    key = hashlib.sha256(f"{model}\0{prompt}".encode()).hexdigest()
+    with _RUN_CACHE_LOCK:
+        response = _RUN_CACHE["responses"].get(key)
+        pending = _RUN_CACHE["pending"].get(key) if response is None else None
+        owner = response is None and pending is None
+        if owner:
+            pending = _RUN_CACHE["pending"][key] = Future()
+    if response is not None:
+        logging.debug("Ollama response reused from this run.")
+        _count_cache_hit()
+        return response
+    if not owner:
+        logging.debug("Waiting for an identical in-flight Ollama request.")
+        response = pending.result()
+        if response:
+            _count_cache_hit()
+        return response
+
+    response = ""
+    try:
+        response = _fetch_ollama(key, model, prompt, base_url, timeout)
+    finally:
+        with _RUN_CACHE_LOCK:
+            del _RUN_CACHE["pending"][key]
+            # Failed calls are not remembered, so a later identical prompt tries again.
+            if response:
+                _RUN_CACHE["responses"][key] = response
+        pending.set_result(response)
+    return response
+
+def _fetch_ollama(key: str, model: str, prompt: str, base_url: str, timeout) -> str:
+    cached = _cache_get(key)
+    if cached is not None:
+        logging.debug("Ollama response served from cache.")
+        return cached
     try:
-        r = requests.post(f"{base_url.rstrip('/')}/api/generate", json={"model": model, "prompt": prompt, "stream": False}, timeout=timeout)
+        with _OLLAMA_SLOTS["sem"]:
+            r = _SESSION.post(f"{base_url.rstrip('/')}/api/generate", data=_ollama_body(model=model, prompt=prompt, stream=False), headers={"Content-Type": "application/json"}, timeout=timeout)
         r.raise_for_status()
-        return (r.json().get("response") or "").strip()
-    except requests.exceptions.RequestException as e:
+        response = (_json_loads(r.content).get("response") or "").strip()
+    except (requests.exceptions.RequestException, ValueError) as e:
         logging.error(f"Ollama API call failed: {e}")
         return ""
+    _cache_put(key, response)
+    return response
+
+# Embedding-based cache of first-pass drafts for near-duplicate pages, stored next to the response cache.
+# Disabled until init_semantic_cache() is called.
+_SEMANTIC = {"embed_model": None, "threshold": 0.92, "entries": {}, "hits": 0}
+
+# Lookups compare against every stored vector of the scope in pure Python (roughly 35 us per
+# 768-dim entry), so each scope keeps only its newest entries, in memory and on disk.
+SEMANTIC_MAX_ENTRIES = 1000
+
+def init_semantic_cache(embed_model: str, threshold: float):
+    """Prunes expired and surplus page embeddings and loads the rest; requires the response cache to be open."""
+    db = _CACHE["db"]
+    if db is None:
+        logging.warning("The semantic cache is stored in the response cache, which is disabled. Ignoring --semantic-cache.")
+        return
+    cutoff = int(time.time()) - _CACHE["ttl"] if _CACHE["ttl"] else 0
+    entries = {}
+    with _CACHE_LOCK:
+        try:
+            db.execute("CREATE TABLE IF NOT EXISTS semantic (scope TEXT, vec BLOB, draft TEXT, ts INTEGER)")
+            db.execute("DELETE FROM semantic WHERE ts < ?", (cutoff,))
+            db.execute("DELETE FROM semantic WHERE rowid NOT IN (SELECT rowid FROM semantic AS newest WHERE newest.scope = semantic.scope ORDER BY ts DESC, rowid DESC LIMIT ?)", (SEMANTIC_MAX_ENTRIES,))
+            db.commit()
+            rows = db.execute("SELECT scope, vec, draft FROM semantic ORDER BY ts, rowid").fetchall()
+        except sqlite3.Error as e:
+            logging.warning(f"Could not open the semantic cache: {e}. Continuing without it.")
+            return
+    for scope, blob, draft in rows:
+        vec = array('f')
+        vec.frombytes(blob)
+        entries.setdefault(scope, deque(maxlen=SEMANTIC_MAX_ENTRIES)).append((vec, draft))
+    _SEMANTIC.update(embed_model=embed_model, threshold=threshold, entries=entries)
+    logging.info(f"Semantic cache enabled with '{embed_model}' ({len(rows)} stored pages, threshold {threshold}).")
+
+def _embed(text: str, base_url: str, timeout=60):
+    """Returns the unit-length Ollama embedding of the text, or None if it cannot be computed."""
+    try:
+        with _OLLAMA_SLOTS["sem"]:
+            r = _SESSION.post(f"{base_url.rstrip('/')}/api/embeddings", data=_ollama_body(model=_SEMANTIC["embed_model"], prompt=text), headers={"Content-Type": "application/json"}, timeout=timeout)
+        r.raise_for_status()
+        vec = _json_loads(r.content).get("embedding") or []
+    except (requests.exceptions.RequestException, ValueError) as e:
+        logging.warning(f"Ollama embedding call failed: {e}")
+        return None
+    norm = math.sqrt(sum(x * x for x in vec))
+    return array('f', (x / norm for x in vec)) if norm else None
+
+def _semantic_lookup(scope: str, vec):
+    """Returns the stored draft of the most similar page if its cosine similarity reaches the threshold."""
+    with _CACHE_LOCK:
+        entries = list(_SEMANTIC["entries"].get(scope, ()))
+    best_score, best_draft = 0.0, None
+    for other, draft in entries:
+        if len(other) == len(vec):
+            score = sum(map(operator.mul, vec, other))
+            if score > best_score:
+                best_score, best_draft = score, draft
+    if best_draft is None or best_score < _SEMANTIC["threshold"]:
+        return None
+    with _CACHE_LOCK:
+        _SEMANTIC["hits"] += 1
+    logging.info(f"Reusing draft of a similar page (similarity {best_score:.3f}).")
+    return best_draft
+
+def _semantic_store(scope: str, vec, draft: str):
+    if not draft:
+        return
+    with _CACHE_LOCK:
+        # The deque drops the oldest entry of a full scope; the database copy is pruned on the next start.
+        _SEMANTIC["entries"].setdefault(scope, deque(maxlen=SEMANTIC_MAX_ENTRIES)).append((vec, draft))
+        try:
+            _CACHE["db"].execute("INSERT INTO semantic (scope, vec, draft, ts) VALUES (?, ?, ?, ?)", (scope, vec.tobytes(), draft, int(time.time())))
+            _CACHE["db"].commit()
+        except sqlite3.Error as e:
+            logging.warning(f"Could not write to the semantic cache: {e}")
+
+def generate_draft(payload: str, config: ScriptConfig, args: argparse.Namespace) -> str:
+    """Returns a first-pass draft, reusing the draft of a near-duplicate page when the semantic cache is enabled."""
+    prompt = config.build_prompt(payload)
+    if not _SEMANTIC["embed_model"]:
+        return call_ollama(args.model, prompt, args.ollama_url)
+
+    # Drafts are only interchangeable for the same models, template and banned terms
+    # (the terms are filled in sorted, so the scope is the same from run to run).
+    scope = hashlib.sha256(f"{args.model}\0{_SEMANTIC['embed_model']}\0{config.build_prompt('')}".encode()).hexdigest()
+    vec = _embed(payload[:1024], args.ollama_url)
+    if vec is not None:
+        draft = _semantic_lookup(scope, vec)
+        if draft is not None:
+            return draft
+    draft = call_ollama(args.model, prompt, args.ollama_url)
+    if vec is not None:
+        _semantic_store(scope, vec, draft)
+    return draft
+
+_VALIDATION_STATS = {"run": 0, "skipped": 0}
+_VALIDATION_LOCK = threading.Lock()
+
+def validation_stats() -> dict:
+    """Returns how many grammar validations this run ran and skipped."""
+    with _VALIDATION_LOCK:
+        return dict(_VALIDATION_STATS)
+
+def _needs_validation(draft: str, config: ScriptConfig) -> bool:
+    """Cheap local check: False when the draft already looks like a clean, finished description."""
+    if not 120 <= len(draft) <= 160:
+        return True
+    if config.FORBIDDEN_CHARS_RE.search(draft) or config.LEAKAGE_RE.search(draft) or "'" in draft:
+        return True
+    if any(p.search(draft) for p in config.DOC_META_PATTERNS):
+        return True
+    words = draft.rstrip(" .").split()
+    if not words:
+        return True
+    return words[0].lower() not in config.VERB_STARTERS or words[-1].lower().strip(",;") in config.TRAILING_STOPWORDS
 
 def validate_and_correct_grammar(sentence: str, model: str, base_url: str, config: ScriptConfig) -> str:
     """Uses a second LLM call to act as a grammar and structure validator."""
@@ -381,7 +888,7 @@ def validate_and_correct_grammar(sentence: str, model: str, base_url: str, confi
         return ""
     
     logging.info(f"Validating grammar for draft: '{sentence}'")
-    prompt = config.PROMPT_TMPL_VALIDATE.format(sentence=sentence)
+    prompt = config.build_validate_prompt(sentence)
     
     # Use the existing call_ollama function for the correction
     corrected_sentence = call_ollama(model, prompt, base_url)
@@ -398,39 +905,22 @@ def sanitize_and_finalize(draft: str, config: ScriptConfig) -> str:
     desc = html.unescape(draft)
     
     # CRITICAL: Remove any leaked prompt instructions - must be done FIRST before other processing
-    # Using simple case-insensitive string replacement for more reliable matching
-    leakage_phrases = [
-        "Follow these rules strictly",
-        "Your task is to",
-        "You must now",
-        "Output only",
-        "Critical:",
-        "Important:",
-        "Note:",
-        "Remember:",
-        "Your response must contain only",
-    ]
-    
-    # Remove leaked phrases (case-insensitive)
-    for phrase in leakage_phrases:
-        # Create a regex that matches the phrase with flexible whitespace
-        pattern = re.compile(re.escape(phrase), re.IGNORECASE)
-        desc = pattern.sub('', desc)
+    desc = config.LEAKAGE_RE.sub('', desc)
     
     # Clean up any resulting multiple spaces after leakage removal
-    desc = re.sub(r'\s+', ' ', desc).strip()
+    desc = config.SPACE_COLLAPSE_RE.sub(' ', desc).strip()
     
     # Intelligently handle possessives before removing other characters
-    desc = re.sub(r"(\w+)'s\b", r"\1s", desc)
+    desc = config.POSSESSIVE_RE.sub(r"\1s", desc)
     desc = desc.replace("'", "")
 
-    desc = re.sub(r"\s+", " ", desc).strip()
-    for name in sorted(config.BANNED_LITERALS, key=len, reverse=True):
-        desc = re.sub(rf"\b{re.escape(name)}\b", "", desc, flags=re.IGNORECASE)
-    desc = config.FORBIDDEN_CHARS_RE.sub(" ", desc)
+    desc = config.SPACE_COLLAPSE_RE.sub(" ", desc).strip()
+    if config.BANNED_LITERALS:
+        desc = remove_keywords(desc, _keyword_patterns(tuple(sorted(config.BANNED_LITERALS))))
+    desc = desc.translate(config.FORBIDDEN_CHARS_TABLE)
     for pat in config.DOC_META_PATTERNS: desc = pat.sub("", desc).strip()
-    desc = re.sub(r"^(by|with|through|using)\s+", "", desc, flags=re.IGNORECASE)
-    desc = re.sub(r"\s{2,}", " ", desc).strip(" ,;:-")
+    desc = config.LEADING_PREPOSITION_RE.sub("", desc)
+    desc = _MULTI_SPACE_RE.sub(" ", desc).strip(" ,;:-")
     if not desc: return ""
     if len(desc) > 160:
         desc = desc[:161]
@@ -445,26 +935,129 @@ def sanitize_and_finalize(draft: str, config: ScriptConfig) -> str:
     if desc: desc = desc[0].upper() + desc[1:]
     return desc
 
+def _finalize_draft(draft: str, path: Path, config: ScriptConfig, args: argparse.Namespace, brands, brands_key=None):
+    """Applies brand correction, grammar validation (unless the draft already looks clean) and cleanup."""
+    draft_after_branding, update_status = post_process_description(draft, str(path), brands, brands_key)
+    if args.always_validate or _needs_validation(draft_after_branding, config):
+        with _VALIDATION_LOCK:
+            _VALIDATION_STATS["run"] += 1
+        draft_after_branding = validate_and_correct_grammar(draft_after_branding, args.model, args.ollama_url, config)
+    else:
+        with _VALIDATION_LOCK:
+            _VALIDATION_STATS["skipped"] += 1
+        logging.info(f"Skipping grammar validation for clean draft: '{draft_after_branding}'")
+    return sanitize_and_finalize(draft_after_branding, config), update_status
+
+def generate_description(payload: str, path: Path, config: ScriptConfig, args: argparse.Namespace, brands, brands_key=None):
+    """Generates a finished description for the payload, retrying once with a longer prompt if it is too short."""
+    draft = generate_draft(payload, config, args)
+    desc, update_status = _finalize_draft(draft, path, config, args, brands, brands_key)
+
+    if not desc or len(desc) < 100:
+        logging.warning(f"First pass description too short ({len(desc)} chars). Retrying for {path}")
+        draft = call_ollama(args.model, config.build_prompt(payload, retry=True), args.ollama_url)
+        desc, update_status = _finalize_draft(draft, path, config, args, brands, brands_key)
+    return desc, update_status
+
+def is_valid_description(desc: str, config: ScriptConfig) -> bool:
+    """True when a description fits the length limits and passes the cleanup pipeline unchanged."""
+    return bool(desc) and 100 <= len(desc) <= 160 and sanitize_and_finalize(desc, config) == desc
+
+def find_adoc_description(raw_text: str, config: ScriptConfig, max_lines: int = 50):
+    """Returns the value of a :description: attribute in the document header, or None."""
+    for line in raw_text.splitlines()[:max_lines]:
+        match = config.DESC_RE.match(line)
+        if match:
+            return line[match.end():].strip()
+    return None
+
+def find_xml_description(raw_bytes: bytes, config: ScriptConfig):
+    """Returns the text of an existing <meta name="description"> tag, or None."""
+    match = config.XML_DESC_RE.search(raw_bytes)
+    if not match:
+        return None
+    return html.unescape(decode_source(match.group(1) or b"")).strip()
+
+def decode_source(data: bytes) -> str:
+    """Decodes UTF-8 file bytes with the newline translation read_text() applies."""
+    text = data.decode("utf-8")
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+@contextlib.contextmanager
+def mapped_file(path: Path):
+    """Yields a read-only memory map of the file, or b'' for an empty file (which cannot be mapped)."""
+    with open(path, 'rb') as fh:
+        if os.fstat(fh.fileno()).st_size == 0:
+            yield b''
+            return
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield mm
+
+def header_bytes(data, max_lines: int = 50) -> bytes:
+    """Returns the bytes of the first max_lines lines, which is all find_adoc_description looks at."""
+    end = -1
+    for _ in range(max_lines):
+        end = data.find(b'\n', end + 1)
+        if end < 0:
+            return data[:]
+    return data[:end]
+
+def existing_description_skip_reason(existing_desc, config: ScriptConfig, args: argparse.Namespace, present_msg: str = "File already has a description."):
+    """Returns why a file with an existing description is left alone, or None if it should be (re)generated."""
+    if existing_desc is None or args.force_overwrite:
+        return None
+    if not args.replace_invalid:
+        return present_msg
+    if is_valid_description(existing_desc, config):
+        return "Existing description is already valid."
+    logging.info(f"Existing description fails the style checks and will be regenerated: '{existing_desc}'")
+    return None
+
 # =========================
 # File Processors
 # =========================
 
+def find_source_files(root: Path, suffixes: tuple):
+    """
+    Yields the files under root whose names end with one of the suffixes, in a
+    single os.scandir walk. Like Path.rglob, it does not descend into symlinked
+    directories and ignores directories it cannot read.
+    """
+    try:
+        with os.scandir(root) as entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                except OSError:
+                    continue
+                if is_dir:
+                    yield from find_source_files(entry.path, suffixes)
+                elif entry.name.endswith(suffixes):
+                    yield Path(entry.path)
+    except OSError:
+        return
+
+_SKIP_DIRS = frozenset(("nav", "navigation", "partials"))
+
 def should_skip(path: Path, config: ScriptConfig) -> bool:
     """Determines if a file should be skipped based on Antora conventions."""
     name = path.name
     if name.startswith('_'):
         logging.debug(f"Skipping {path}: starts with underscore")
         return True
-    if config.NAV_GENERIC_RE.match(name) or config.NAV_GUIDE_RE.match(name):
+    if name[:3].lower() == 'nav' and config.NAV_GENERIC_RE.match(name):
         logging.debug(f"Skipping {path}: navigation file")
         return True
     # Skip files in nav, navigation, or partials directories
-    path_parts_lower = [part.lower() for part in path.parts]
-    if any(p in ("nav", "navigation", "partials") for p in path_parts_lower):
+    if any(part.lower() in _SKIP_DIRS for part in path.parts):
         logging.debug(f"Skipping {path}: in nav/navigation/partials directory")
         return True
     return False
 
+_SIMPLE_ATTR_RE = re.compile(r'^:([a-zA-Z0-9_-]+):(?:\s+(.*))?$')
+
 def load_adoc_attributes(file_path: Path) -> dict:
     """A simple parser for standard, non-conditional AsciiDoc attribute files."""
     attributes = {}
@@ -472,7 +1065,7 @@ def load_adoc_attributes(file_path: Path) -> dict:
         with file_path.open('r', encoding='utf-8') as f:
             for line in f:
                 # This regex handles :attr: value and :attr:
-                match = re.match(r'^:([a-zA-Z0-9_-]+):(?:\s+(.*))?$', line)
+                match = _SIMPLE_ATTR_RE.match(line)
                 if match:
                     key, value = match.groups()
                     attributes[key] = value.strip() if value is not None else ""
@@ -480,6 +1073,63 @@ def load_adoc_attributes(file_path: Path) -> dict:
         logging.error(f"Could not read attributes file {file_path}: {e}")
     return attributes
 
+# One scan per line of an attributes file: endif, ifndef, ifeval or an attribute definition.
+_ATTR_FILE_LINE_RE = re.compile(
+    r'^(?:(?P<endif>endif::\[\])'
+    r'|ifndef::(?P<ifndef>[\w-]+)\[\]'
+    r'|ifeval::\["\{(?P<ifeval>[\w-]+)\}" == "(?P<ifeval_value>[^"]+)"\]'
+    r'|:(?P<attr>[\w-]+):(?:\s+(?P<value>.*))?)$'
+)
+
+# An {name} attribute reference, in attribute values and in page text alike.
+_ATTR_REF_RE = re.compile(r'\{([\w-]+)\}')
+
+def _expand_attribute_values(attributes: dict) -> None:
+    """
+    Expands {placeholder} references in attribute values in place. Each value is
+    expanded once after the attributes it references; values caught in a
+    reference cycle fall back to the bounded iterative replacement.
+    """
+    resolved, visiting, cyclic = set(), set(), set()
+
+    def expand(key):
+        value = attributes[key]
+        if key in resolved or not isinstance(value, str) or '{' not in value:
+            resolved.add(key)
+            return
+        visiting.add(key)
+
+        def substitute(match):
+            name = match.group(1)
+            if name not in attributes:
+                return match.group(0)
+            if name in visiting:
+                # Everything on the current expansion path depends on the cycle.
+                cyclic.update(visiting)
+                return match.group(0)
+            expand(name)
+            if name in cyclic:
+                cyclic.add(key)
+                return match.group(0)
+            return str(attributes[name])
+
+        attributes[key] = _ATTR_REF_RE.sub(substitute, value)
+        visiting.discard(key)
+        resolved.add(key)
+
+    for key in list(attributes):
+        expand(key)
+
+    # Limit iterations to prevent infinite loops from bad definitions
+    cyclic_keys = [key for key in attributes if key in cyclic]
+    for _ in range(10 if cyclic_keys else 0):
+        for key in cyclic_keys:
+            value = attributes[key]
+            for placeholder in _ATTR_REF_RE.findall(value):
+                if placeholder in attributes:
+                    value = value.replace(f'{{{placeholder}}}', str(attributes[placeholder]))
+            attributes[key] = value
+
 def load_and_process_adoc_attributes(file_path: Path, initial_context: Dict[str, str]) -> dict:
     """
     Loads and processes an AsciiDoc attributes file, handling ifndef, ifeval,
@@ -492,12 +1142,6 @@ def load_and_process_adoc_attributes(file_path: Path, initial_context: Dict[str,
     attributes = initial_context.copy()
     lines = file_path.read_text(encoding='utf-8').splitlines()
     
-    # Pre-compile regex patterns for efficiency
-    attr_re = re.compile(r'^:([\w-]+):(?:\s+(.*))?$')
-    ifndef_re = re.compile(r'^ifndef::([\w-]+)\[\]$')
-    ifeval_re = re.compile(r'^ifeval::\["\{([\w-]+)\}" == "([^"]+)"\]$')
-    endif_re = re.compile(r'^endif::\[\]$')
-    
     # --- First Pass: Parse file and handle conditionals ---
     in_active_block = True
     active_block_stack = []
@@ -507,26 +1151,28 @@ def load_and_process_adoc_attributes(file_path: Path, initial_context: Dict[str,
         if not line or line.startswith('//'):
             continue
 
+        match = _ATTR_FILE_LINE_RE.match(line)
+        if not match:
+            continue
+
         # Handle endif
-        if endif_re.match(line):
+        if match.group('endif'):
             if active_block_stack:
                 in_active_block = active_block_stack.pop()
             continue
 
         # Handle ifndef
-        match = ifndef_re.match(line)
-        if match:
-            key = match.group(1)
+        key = match.group('ifndef')
+        if key:
             active_block_stack.append(in_active_block)
             in_active_block = in_active_block and (key not in attributes)
             continue
-            
+
         # Handle ifeval
-        match = ifeval_re.match(line)
-        if match:
-            key, value = match.groups()
+        key = match.group('ifeval')
+        if key:
             active_block_stack.append(in_active_block)
-            is_match = attributes.get(key) == value
+            is_match = attributes.get(key) == match.group('ifeval_value')
             in_active_block = in_active_block and is_match
             continue
 
@@ -534,124 +1180,139 @@ def load_and_process_adoc_attributes(file_path: Path, initial_context: Dict[str,
             continue
 
         # Handle normal attribute definitions
-        match = attr_re.match(line)
-        if match:
-            key, value = match.groups()
-            # Handle attributes with no value (e.g., :showtitle:)
-            attributes[key] = value.strip() if value is not None else ""
+        key, value = match.group('attr', 'value')
+        # Handle attributes with no value (e.g., :showtitle:)
+        attributes[key] = value.strip() if value is not None else ""
+
+    # --- Second Pass: Expand attribute values once, in dependency order ---
+    _expand_attribute_values(attributes)
 
-    # --- Second Pass: Iteratively resolve attribute values ---
-    unresolved = True
-    # Limit iterations to prevent infinite loops from bad definitions
-    for _ in range(10): 
-        if not unresolved:
-            break
-        unresolved = False
-        for key, value in attributes.items():
-            if isinstance(value, str) and '{' in value:
-                # Find all {placeholder} occurrences
-                placeholders = re.findall(r'\{([\w-]+)\}', value)
-                if not placeholders:
-                    continue
-                
-                unresolved = True
-                new_value = value
-                for placeholder in placeholders:
-                    if placeholder in attributes:
-                        new_value = new_value.replace(f'{{{placeholder}}}', str(attributes[placeholder]))
-                attributes[key] = new_value
-    
     logging.info(f"Successfully processed and expanded attributes from {file_path}")
     return attributes
 
 
+# Markup patterns used on every AsciiDoc file.
+_ADOC_HEADING_RE = re.compile(r'^==+\s+.*$', re.MULTILINE)
+_ADOC_BULLET_RE = re.compile(r'^[\*\.\-]+\s+', re.MULTILINE)
+_ADOC_ANCHOR_RE = re.compile(r'\[\[.*?\]\]')
+_ADOC_CROSSREF_RE = re.compile(r'<<.*?>>')
+_ADOC_IMAGE_RE = re.compile(r'image::\S+\[.*?\]')
+_ADOC_COMMENT_RE = re.compile(r'//.*$', re.MULTILINE)
+_ADOC_MONO_RE = re.compile(r'`([^`]+)`')
+_ADOC_BOLD_RE = re.compile(r'\*([^*]+)\*')
+_ADOC_ITALIC_RE = re.compile(r'_([^_]+)_')
+_ADOC_XREF_RE = re.compile(r'xref:\S+\[(.*?)\]')
+_ADOC_BLANK_LINES_RE = re.compile(r'\n{2,}')
+
 def resolve_attributes(text: str, attributes: dict) -> str:
-    """Iteratively replaces AsciiDoc attributes in a string."""
-    if not attributes: return re.sub(r"\{([A-Za-z0-9_-]+)\}", "", text)
-    # Iteratively replace attributes until no placeholders are left
+    """
+    Replaces AsciiDoc attributes in a string. Every {name} reference is found in
+    one scan of the text and looked up in the attributes dict, however many
+    attributes are defined.
+    """
+    # Most pages reference no attributes at all.
+    if '{' not in text: return text
+    if not attributes: return _ATTR_REF_RE.sub("", text)
+    lookup = attributes.get
+    def substitute(match):
+        value = lookup(match.group(1))
+        return match.group(0) if value is None else str(value)
+
+    # Each pass is a single scan; repeat only while substituted values add new placeholders
     for _ in range(10): # Safety break for circular references
-        if '{' not in text:
-            break
-        # Create a temporary copy for this iteration's replacements
-        temp_text = text
-        for key, value in attributes.items():
-            temp_text = temp_text.replace(f'{{{key}}}', str(value))
+        temp_text = _ATTR_REF_RE.sub(substitute, text)
         # If no changes were made in a full pass, we're done
         if temp_text == text:
             break
         text = temp_text
+        if '{' not in text:
+            return text
 
     # Remove any remaining (unresolved) attributes
-    text = re.sub(r"\{([A-Za-z0-9_-]+)\}", "", text)
+    text = _ATTR_REF_RE.sub("", text)
     return text
 
-def extract_adoc_payload(content: str, max_len: int = 4000) -> str:
+def extract_adoc_payload(content: str, config: ScriptConfig, max_len: int = 4000) -> str:
     """Converts the entire AsciiDoc content to plain text for analysis."""
     lines = content.splitlines()
     header_end = 0
-    if lines and re.match(r"^\s*=\s+.+", lines[0]):
+    if lines and config.TITLE_RE.match(lines[0]):
         header_end = 1
         while header_end < len(lines) and (lines[header_end].strip().startswith(':') or not lines[header_end].strip()):
             header_end += 1
     text = "\n".join(lines[header_end:])
     
-    text = re.sub(r'^==+\s+.*$', '', text, flags=re.MULTILINE)
-    text = re.sub(r'^[\*\.\-]+\s+', '', text, flags=re.MULTILINE)
-    text = re.sub(r'\[\[.*?\]\]', '', text)
-    text = re.sub(r'<<.*?>>', '', text)
-    text = re.sub(r'image::\S+\[.*?\]', '', text)
-    text = re.sub(r'\|===', '', text)
-    text = re.sub(r'\|', ' ', text)
-    text = re.sub(r'----', '', text)
-    text = re.sub(r'//.*$', '', text, flags=re.MULTILINE)
-    text = re.sub(r'`([^`]+)`', r'\1', text)
-    text = re.sub(r'\*([^*]+)\*', r'\1', text)
-    text = re.sub(r'_([^_]+)_', r'\1', text)
-    text = re.sub(r'xref:\S+\[(.*?)\]', r'\1', text)
-    text = re.sub(r'\n{2,}', '\n', text)
+    # The passes must run in this order, since each one sees the previous one's output.
+    # A pass only runs if its marker occurs in the text, and literal markers use str.replace.
+    if '==' in text:
+        text = _ADOC_HEADING_RE.sub('', text)
+    text = _ADOC_BULLET_RE.sub('', text)
+    if '[[' in text:
+        text = _ADOC_ANCHOR_RE.sub('', text)
+    if '<<' in text:
+        text = _ADOC_CROSSREF_RE.sub('', text)
+    if 'image::' in text:
+        text = _ADOC_IMAGE_RE.sub('', text)
+    if '|' in text:
+        text = text.replace('|===', '').replace('|', ' ')
+    if '----' in text:
+        text = text.replace('----', '')
+    if '//' in text:
+        text = _ADOC_COMMENT_RE.sub('', text)
+    if '`' in text:
+        text = _ADOC_MONO_RE.sub(r'\1', text)
+    if '*' in text:
+        text = _ADOC_BOLD_RE.sub(r'\1', text)
+    if '_' in text:
+        text = _ADOC_ITALIC_RE.sub(r'\1', text)
+    if 'xref:' in text:
+        text = _ADOC_XREF_RE.sub(r'\1', text)
+    if '\n\n' in text:
+        text = _ADOC_BLANK_LINES_RE.sub('\n', text)
     return text.strip()[:max_len]
 
-def process_adoc_file(path: Path, config: ScriptConfig, args: argparse.Namespace, attributes: dict, html_log_entries: list = None, brands=[]):
+def extract_docbook_text(element, max_chars: int = 4000) -> str:
+    """Joins the stripped text nodes under an element, stopping once max_chars of payload are collected."""
+    # itertext() rather than tostring(method='text'): the latter serializes the whole subtree
+    # even past max_chars and expands entity references the parser deliberately leaves unresolved.
+    parts, size = [], 0
+    for text in element.itertext():
+        text = text.strip()
+        if text:
+            parts.append(text)
+            size += len(text) + 1
+            if size > max_chars:
+                break
+    return "\n".join(parts)
+
+def process_adoc_file(path: Path, config: ScriptConfig, args: argparse.Namespace, attributes: dict, html_log_entries: list = None, brands=[], brands_key=None):
     file_type = "AsciiDoc"
     logging.info(f"Processing {file_type}: {path}")
     try:
-        raw_text = path.read_text(encoding="utf-8")
-        if config.DESC_RE.search(raw_text) and not args.force_overwrite:
-            msg = "File already has a description."
+        # Pages that are skipped only have their header decoded.
+        with mapped_file(path) as data:
+            msg = existing_description_skip_reason(find_adoc_description(header_bytes(data).decode("utf-8"), config), config, args)
+            raw_text = None if msg else decode_source(data[:])
+        if msg:
             logging.info(f"SKIPPED: {msg} ({path})")
             add_html_log_entry(html_log_entries, path, file_type, "SKIPPED", msg)
             return
         
         # Attributes are resolved first for AsciiDoc
         resolved_text = resolve_attributes(raw_text, attributes)
-        payload = extract_adoc_payload(resolved_text)
+        payload = extract_adoc_payload(resolved_text, config)
         if not payload.strip():
             msg = "Empty content payload after extraction."
             logging.warning(f"SKIPPED: {msg} ({path})")
             add_html_log_entry(html_log_entries, path, file_type, "WARNING", msg)
             return
 
-        prompt = config.PROMPT_TMPL.format(blacklist=", ".join(config.BANNED_LITERALS), content=payload)
-        draft = call_ollama(args.model, prompt, args.ollama_url)
-
-        draft_after_branding, update_status = post_process_description(draft, str(path), brands)
-        corrected_draft = validate_and_correct_grammar(draft_after_branding, args.model, args.ollama_url, config)
-        desc = sanitize_and_finalize(corrected_draft, config)
-
+        desc, update_status = generate_description(payload, path, config, args, brands, brands_key)
         if not desc or len(desc) < 100:
-            logging.warning(f"First pass description too short ({len(desc)} chars). Retrying for {path}")
-            retry_prompt = config.PROMPT_TMPL_RETRY.format(blacklist=", ".join(config.BANNED_LITERALS), content=payload)
-            draft = call_ollama(args.model, retry_prompt, args.ollama_url)
-            
-            draft_after_branding_retry, update_status = post_process_description(draft, str(path), brands)
-            corrected_draft_retry = validate_and_correct_grammar(draft_after_branding_retry, args.model, args.ollama_url, config)
-            desc = sanitize_and_finalize(corrected_draft_retry, config)
-
-            if not desc or len(desc) < 100:
-                msg = f"Generated description still too short after retry ({len(desc)} chars)."
-                logging.error(f"SKIPPED: {msg} ({path})")
-                add_html_log_entry(html_log_entries, path, file_type, "ERROR", msg)
-                return
+            msg = f"Generated description still too short after retry ({len(desc)} chars)."
+            logging.error(f"SKIPPED: {msg} ({path})")
+            add_html_log_entry(html_log_entries, path, file_type, "ERROR", msg)
+            return
         
         if args.dry_run:
             logging.info(f"[DRY RUN] Would update {path}")
@@ -672,7 +1333,9 @@ def process_adoc_file(path: Path, config: ScriptConfig, args: argparse.Namespace
         if update_status:
             status = update_status
 
-        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        # Stream the lines through the write buffer instead of joining the whole file first.
+        with path.open('w', encoding="utf-8", buffering=65536) as f:
+            f.writelines(line + "\n" for line in lines)
         logging.info(f"{status}: Description for {path} ({len(desc)} chars)")
         add_html_log_entry(html_log_entries, path, file_type, status, desc)
         return desc
@@ -686,17 +1349,45 @@ def process_adoc_file(path: Path, config: ScriptConfig, args: argparse.Namespace
 # This function uses a pure string/regex approach to perform the precise
 # namespace modifications requested.
 # ==============================================================================
-def process_xml_file(path: Path, config: ScriptConfig, args: argparse.Namespace, html_log_entries: list = None, brands=[]):
+# Tag patterns used when rewriting DocBook sources in place.
+# Word boundary keeps <info> from matching <informaltable>.
+_INFO_TAG_RE = re.compile(r"<\binfo\b[^>]*>", re.IGNORECASE)
+_XMLNS_ATTR_RE = re.compile(r'\s+xmlns(?::\w+)?="[^"]+"')
+# The attributes part stays inside the tag, so a non-empty <meta> cannot run on to a later "/>".
+_EXISTING_META_RE = re.compile(r'<meta\s+name="description"[^>]*?(?:/>|>.*?</meta>)', re.IGNORECASE | re.DOTALL)
+
+@functools.lru_cache(maxsize=32)
+def _root_tag_re(local_name: str) -> re.Pattern:
+    """Returns the opening-tag pattern for a DocBook root element name."""
+    return re.compile(fr"<{local_name}[^>]*>", re.DOTALL)
+
+# lxml parsers can be reused between parses but not shared by threads, so each worker keeps its own.
+_XML_PARSERS = threading.local()
+
+def _xml_parser(kind: str):
+    """Returns this thread's 'payload' parser (loads the DTD) or 'include' parser."""
+    parsers = getattr(_XML_PARSERS, "parsers", None)
+    if parsers is None:
+        parsers = _XML_PARSERS.parsers = {
+            "payload": ET.XMLParser(resolve_entities=False, load_dtd=True),
+            "include": ET.XMLParser(resolve_entities=False),
+        }
+    return parsers[kind]
+
+def process_xml_file(path: Path, config: ScriptConfig, args: argparse.Namespace, html_log_entries: list = None, brands=[], brands_key=None):
     ITS_NS = "http://www.w3.org/2005/11/its"
     ns = {'db': 'http://docbook.org/ns/docbook', 'xi': 'http://www.w3.org/2001/XInclude'}
 
     try:
         # MODIFIED: Payload parser now set to resolve_entities=False to prevent AI hyper-focus
+        # The file is read once; the parser and the text rewrite below share the buffer.
+        raw_bytes = path.read_bytes()
         base_url = path.resolve().parent.as_uri() + "/"
-        parser_payload = ET.XMLParser(resolve_entities=False, load_dtd=True)
-        payload_tree = ET.parse(str(path), parser=parser_payload, base_url=base_url)
+        payload_tree = ET.parse(io.BytesIO(raw_bytes), parser=_xml_parser("payload"), base_url=base_url)
         
         root = payload_tree.getroot()
+        # Taken before xinclude() so the rewrite below needs no second parse of the file.
+        root_tag_local_name = ET.QName(root.tag).localname
         file_type = "DocBook XML"
         try:
             version = root.get("version")
@@ -719,7 +1410,7 @@ def process_xml_file(path: Path, config: ScriptConfig, args: argparse.Namespace,
                 
                 try:
                     # Use a non-resolving parser here too for consistency
-                    included_tree = ET.parse(str(included_path), ET.XMLParser(resolve_entities=False))
+                    included_tree = ET.parse(str(included_path), _xml_parser("include"))
                     title_element = included_tree.find('.//db:info/db:title', namespaces=ns)
                     if title_element is not None:
                         titles.append(''.join(title_element.itertext()).strip())
@@ -730,17 +1421,17 @@ def process_xml_file(path: Path, config: ScriptConfig, args: argparse.Namespace,
             abstract_element = root.find('.//db:info/db:abstract', namespaces=ns)
             if abstract_element is not None:
                 logging.info("Found <abstract> tag. Using it as the primary payload.")
-                payload = "\n".join(text.strip() for text in abstract_element.itertext() if text.strip())
+                payload = extract_docbook_text(abstract_element)
             else:
                 payload_tree.xinclude() # xinclude might still be useful for structure
-                payload = "\n".join(text.strip() for text in payload_tree.getroot().itertext() if text.strip())
+                payload = extract_docbook_text(payload_tree.getroot())
 
-        raw_text = path.read_text(encoding="utf-8")
-        if re.search(r'<meta\s+name="description"[^>]*>', raw_text, re.IGNORECASE) and not args.force_overwrite:
-            msg = "File already has a <meta name='description'> tag."
+        msg = existing_description_skip_reason(find_xml_description(raw_bytes, config), config, args, "File already has a <meta name='description'> tag.")
+        if msg:
             logging.info(f"SKIPPED: {msg} ({path})")
             add_html_log_entry(html_log_entries, path, file_type, "SKIPPED", msg)
             return
+        raw_text = decode_source(raw_bytes)
 
         if not payload.strip():
             msg = "Empty content payload after extraction."
@@ -749,27 +1440,12 @@ def process_xml_file(path: Path, config: ScriptConfig, args: argparse.Namespace,
             return
 
         # --- AI Generation and Processing ---
-        prompt = config.PROMPT_TMPL.format(blacklist=", ".join(config.BANNED_LITERALS), content=payload[:4000])
-        draft = call_ollama(args.model, prompt, args.ollama_url)
-        
-        draft_after_branding, update_status = post_process_description(draft, str(path), brands)
-        corrected_draft = validate_and_correct_grammar(draft_after_branding, args.model, args.ollama_url, config)
-        desc = sanitize_and_finalize(corrected_draft, config)
-
+        desc, update_status = generate_description(payload[:4000], path, config, args, brands, brands_key)
         if not desc or len(desc) < 100:
-            logging.warning(f"First pass description too short ({len(desc)} chars). Retrying for {path}")
-            retry_prompt = config.PROMPT_TMPL_RETRY.format(blacklist=", ".join(config.BANNED_LITERALS), content=payload[:4000])
-            draft = call_ollama(args.model, retry_prompt, args.ollama_url)
-            
-            draft_after_branding_retry, update_status = post_process_description(draft, str(path), brands)
-            corrected_draft_retry = validate_and_correct_grammar(draft_after_branding_retry, args.model, args.ollama_url, config)
-            desc = sanitize_and_finalize(corrected_draft_retry, config)
-
-            if not desc or len(desc) < 100:
-                msg = f"Generated description still too short after retry ({len(desc)} chars)."
-                logging.error(f"SKIPPED: {msg} ({path})")
-                add_html_log_entry(html_log_entries, path, file_type, "ERROR", msg)
-                return
+            msg = f"Generated description still too short after retry ({len(desc)} chars)."
+            logging.error(f"SKIPPED: {msg} ({path})")
+            add_html_log_entry(html_log_entries, path, file_type, "ERROR", msg)
+            return
         
         # MODIFIED: Entities are resolved at the end for DocBook files.
         desc = resolve_entities_in_string(desc, brands)
@@ -780,59 +1456,39 @@ def process_xml_file(path: Path, config: ScriptConfig, args: argparse.Namespace,
             return desc
 
         # --- Direct String/Regex Modification ---
-        file_content = path.read_text(encoding='utf-8')
+        # Edits are collected as (start, end, replacement) spans of the original text
+        # and applied in a single join, instead of copying the file once per edit.
+        file_content = raw_text
+        edits = []
 
         # 1. Ensure 'its' namespace is on the root element.
-        try:
-            parser_tag_find = ET.XMLParser(resolve_entities=False)
-            tree_tag_find = ET.parse(str(path), parser_tag_find)
-            root_tag_local_name = ET.QName(tree_tag_find.getroot().tag).localname
-            
-            root_tag_pattern = re.compile(fr"<{root_tag_local_name}[^>]*>", re.DOTALL)
-            root_tag_match = root_tag_pattern.search(file_content)
-            
-            if root_tag_match:
-                original_root_tag = root_tag_match.group(0)
-                if 'xmlns:its' not in original_root_tag:
-                    replacement_marker = f"<{root_tag_local_name}"
-                    new_root_tag = original_root_tag.replace(
-                        replacement_marker,
-                        f'{replacement_marker} xmlns:its="{ITS_NS}"',
-                        1
-                    )
-                    file_content = file_content.replace(original_root_tag, new_root_tag, 1)
-            else:
-                 logging.warning(f"Could not find root tag regex match for '{root_tag_local_name}' in {path}.")
-        except ET.XMLSyntaxError as e:
-            logging.warning(f"LXML parse failed for {path} while finding root tag: {e}. Skipping 'its' namespace injection.")
+        root_tag_match = _root_tag_re(root_tag_local_name).search(file_content)
+        if root_tag_match:
+            original_root_tag = root_tag_match.group(0)
+            if 'xmlns:its' not in original_root_tag:
+                replacement_marker = f"<{root_tag_local_name}"
+                new_root_tag = original_root_tag.replace(
+                    replacement_marker,
+                    f'{replacement_marker} xmlns:its="{ITS_NS}"',
+                    1
+                )
+                edits.append((root_tag_match.start(), root_tag_match.end(), new_root_tag))
+        else:
+             logging.warning(f"Could not find root tag regex match for '{root_tag_local_name}' in {path}.")
 
         # 2. Actively remove all xmlns attributes from the <info> tag.
-        # Use word boundary to avoid matching <informaltable>
-        info_tag_pattern = re.compile(r"<\binfo\b[^>]*>", re.IGNORECASE)
-        info_tag_match = info_tag_pattern.search(file_content)
-        
-        # If no <info> tag exists, create one.
-        if not info_tag_match:
-            root_tag_pattern = re.compile(fr"<{root_tag_local_name}[^>]*>", re.DOTALL)
-            root_tag_match = root_tag_pattern.search(file_content)
-            if root_tag_match:
-                original_root_tag = root_tag_match.group(0)
-                # Add an info block right after the root tag's opening
-                insertion_point = f"{original_root_tag}\n  <info></info>"
-                file_content = file_content.replace(original_root_tag, insertion_point, 1)
-                # Find the newly created info tag
-                info_tag_match = info_tag_pattern.search(file_content)
-
+        info_tag_match = _INFO_TAG_RE.search(file_content)
+        create_info = False
         if info_tag_match:
             original_info_tag = info_tag_match.group(0)
-            xmlns_pattern = re.compile(r'\s+xmlns(?::\w+)?="[^"]+"')
-            cleaned_info_tag = xmlns_pattern.sub('', original_info_tag)
-            
+            cleaned_info_tag = _XMLNS_ATTR_RE.sub('', original_info_tag)
             if original_info_tag != cleaned_info_tag:
-                file_content = file_content.replace(original_info_tag, cleaned_info_tag, 1)
-                info_tag_to_modify = cleaned_info_tag
-            else:
-                info_tag_to_modify = original_info_tag
+                edits.append((info_tag_match.start(), info_tag_match.end(), cleaned_info_tag))
+            info_end = info_tag_match.end()
+        elif root_tag_match:
+            # If no <info> tag exists, create one right after the root tag's opening.
+            create_info = True
+            info_end = root_tag_match.end()
         else:
             msg = "No <info> block found and could not create one. Cannot process file."
             logging.warning(f"SKIPPED: {msg} ({path})")
@@ -840,19 +1496,28 @@ def process_xml_file(path: Path, config: ScriptConfig, args: argparse.Namespace,
             return
 
         # 3. Add or Replace the meta tag.
-        existing_meta_pattern = re.compile(r'<meta\s+name="description".*?/>|<meta\s+name="description".*?>.*?</meta>', re.IGNORECASE | re.DOTALL)
         new_meta_string = f'<meta name="description" its:translate="yes">{html.escape(desc)}</meta>'
 
-        status = ""
-        final_text = ""
-
-        if existing_meta_pattern.search(file_content):
+        meta_match = _EXISTING_META_RE.search(file_content)
+        if meta_match:
             status = "REPLACED"
-            final_text = existing_meta_pattern.sub(new_meta_string, file_content, 1)
+            edits.append((meta_match.start(), meta_match.end(), new_meta_string))
+            meta_insertion = ""
         else:
             status = "ADDED"
-            insertion_text = f"{info_tag_to_modify}\n    {new_meta_string}"
-            final_text = file_content.replace(info_tag_to_modify, insertion_text, 1)
+            meta_insertion = f"\n    {new_meta_string}"
+        if create_info:
+            edits.append((info_end, info_end, f"\n  <info>{meta_insertion}</info>"))
+        elif meta_insertion:
+            edits.append((info_end, info_end, meta_insertion))
+
+        parts, pos = [], 0
+        for edit_start, edit_end, replacement in sorted(edits, key=lambda e: (e[0], e[1])):
+            parts.append(file_content[pos:edit_start])
+            parts.append(replacement)
+            pos = edit_end
+        parts.append(file_content[pos:])
+        final_text = "".join(parts)
         
         if update_status:
             status = update_status
@@ -867,10 +1532,26 @@ def process_xml_file(path: Path, config: ScriptConfig, args: argparse.Namespace,
         add_html_log_entry(html_log_entries, path, "DocBook XML", "ERROR", str(e))
         return
 
+def process_path(path: Path, config: ScriptConfig, args: argparse.Namespace, attributes: dict, html_log_entries: list = None, brands=[], brands_key=None):
+    """Dispatches a single file to the matching processor."""
+    if path.suffix.lower() == '.adoc':
+        return process_adoc_file(path, config, args, attributes, html_log_entries, brands, brands_key)
+    if path.suffix.lower() == '.xml':
+        return process_xml_file(path, config, args, html_log_entries, brands, brands_key)
+    return None
+
 # =========================
 # Main Execution
 # =========================
 
+def default_concurrency() -> int:
+    """Returns $OLLAMA_NUM_PARALLEL, or 8 when it is unset, not a number, or Ollama's 0 ("auto")."""
+    try:
+        parallel = int(os.environ.get("OLLAMA_NUM_PARALLEL", ""))
+    except ValueError:
+        return 8
+    return parallel if parallel >= 1 else 8
+
 def main():
     ap = argparse.ArgumentParser(description="Generate meta descriptions for AsciiDoc and DocBook files.")
     ap.add_argument("root", help="Path to the root directory of your documentation files.")
@@ -878,6 +1559,7 @@ def main():
     ap.add_argument("--ollama-url", default=os.environ.get("OLLAMA_URL", "http://127.0.0.1:11434"), help="Ollama base URL.")
     ap.add_argument("--type", default="all", choices=['adoc', 'xml', 'all'], help="Choose the type of files to process (default: all).")
     ap.add_argument("--force-overwrite", action="store_true", help="Overwrite existing descriptions.")
+    ap.add_argument("--replace-invalid", action="store_true", help="Regenerate existing descriptions only if they fail the length and style checks.")
     ap.add_argument("--dry-run", action="store_true", help="Preview changes without writing to files.")
     ap.add_argument("--html-log", help="Path to an HTML file to log all actions.")
     ap.add_argument("--report-title", default="Description Generation Report", help="Set a custom title for the HTML report.")
@@ -887,9 +1569,24 @@ def main():
     ap.add_argument("--entities-file", required=False, help="Optional path to an entities file (.adoc or .ent) to extract acronyms/brands.")
     # NEW: Flag for conditional builds
     ap.add_argument("-a", "--build-attributes", action="append", help="Set an AsciiDoc attribute for conditional processing, e.g., 'build-type=product'. Can be used multiple times.")
+    ap.add_argument("--always-validate", action="store_true", help="Run the grammar validation pass even for drafts that already look clean.")
+    ap.add_argument("--no-cache", action="store_true", help="Do not read or write the on-disk Ollama response cache.")
+    ap.add_argument("--cache-ttl", type=int, default=0, help="Maximum age in seconds of cached Ollama responses (default: 0, never expire).")
+    ap.add_argument("--semantic-cache", action="store_true", help="Reuse drafts of pages whose content embedding is nearly identical to an earlier page.")
+    ap.add_argument("--embed-model", default="nomic-embed-text", help="Ollama embedding model for --semantic-cache (default: nomic-embed-text).")
+    ap.add_argument("--semantic-threshold", type=float, default=0.92, help="Minimum cosine similarity for a --semantic-cache hit (default: 0.92).")
+    ap.add_argument("--concurrency", type=int, default=default_concurrency(), help="Maximum number of concurrent Ollama requests, batched together by the server (default: $OLLAMA_NUM_PARALLEL if set to a positive number, else 8).")
+    ap.add_argument("--keep-alive", default="30m", help="How long Ollama keeps the model loaded after each request, e.g. '30m', '3600' (seconds) or '-1' for forever (default: 30m). Pass an empty string to use the server default.")
+    ap.add_argument("--workers", type=int, help="Number of worker threads processing files (default: twice --concurrency, so parsing overlaps in-flight requests).")
 
     args = ap.parse_args()
     args.report_title = args.report_title.replace('_', ' ')
+    if args.concurrency < 1:
+        ap.error("--concurrency must be at least 1")
+    if args.workers is None:
+        args.workers = args.concurrency * 2
+    elif args.workers < 1:
+        ap.error("--workers must be at least 1")
 
     # --- Setup ---
     logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO, format='[%(levelname)-7s] %(message)s')
@@ -899,9 +1596,15 @@ def main():
     
     config = ScriptConfig()
     if args.banned_terms:
-        config.BANNED_LITERALS.update(x.strip() for x in args.banned_terms.split(","))
+        config.add_banned_terms(x.strip() for x in args.banned_terms.split(","))
 
     system_info = get_system_info()
+    set_ollama_concurrency(args.concurrency)
+    set_ollama_keep_alive(args.keep_alive)
+    if not args.no_cache:
+        init_response_cache(cache_home() / "doc-lama-metagen.db", args.cache_ttl)
+    if args.semantic_cache:
+        init_semantic_cache(args.embed_model, args.semantic_threshold)
     
     # --- MODIFIED: Conditional attribute loading ---
     attributes = {}
@@ -923,16 +1626,14 @@ def main():
 
     # MODIFIED: Removed acronyms_text loading
     brands = load_brand_config_from_entities(args.entities_file)
+    brands_key = build_brands_key(brands)
     html_log_entries = [] if args.html_log else None
     
     logging.info(f"Starting in GENERATE mode. Root: {root}")
     if args.dry_run: logging.warning("Dry run enabled. No files will be modified.")
 
-    files_to_scan = []
-    if args.type in ['adoc', 'all']:
-        files_to_scan.extend(root.rglob("*.adoc"))
-    if args.type in ['xml', 'all']:
-        files_to_scan.extend(root.rglob("*.xml"))
+    suffixes = {'adoc': ('.adoc',), 'xml': ('.xml',), 'all': ('.adoc', '.xml')}[args.type]
+    files_to_scan = list(find_source_files(root, suffixes))
     
     logging.info(f"Found {len(files_to_scan)} initial files.")
     
@@ -942,28 +1643,52 @@ def main():
     changed_files_count = 0
     start_time = time.monotonic()
 
-    for path in sorted(final_file_list):
-        result = None
-        if path.suffix.lower() == '.adoc':
-            # MODIFIED: Removed acronyms_text from call
-            result = process_adoc_file(path, config, args, attributes, html_log_entries, brands)
-        elif path.suffix.lower() == '.xml':
-            # MODIFIED: Removed acronyms_text from call
-            result = process_xml_file(path, config, args, html_log_entries, brands)
-        
-        if result and not args.dry_run:
-            changed_files_count += 1
+    # Each file runs its draft/validate pipeline in its own worker, so the LLM calls
+    # of different files overlap: while one file is being validated, the next is drafted.
+    ordered_paths = sorted(final_file_list)
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        futures = {executor.submit(process_path, path, config, args, attributes, html_log_entries, brands, brands_key): path for path in ordered_paths}
+        try:
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # One bad file (e.g. undecodable bytes) must not abort the run and lose the report.
+                    path = futures[future]
+                    file_type = "AsciiDoc" if path.suffix.lower() == '.adoc' else "DocBook XML"
+                    logging.error(f"Unexpected error while processing {path}: {e}", exc_info=args.verbose)
+                    add_html_log_entry(html_log_entries, path, file_type, "ERROR", f"Unexpected error: {e}")
+                    continue
+                if result and not args.dry_run:
+                    changed_files_count += 1
+        except KeyboardInterrupt:
+            # Drop the queued files; leaving the with block then only waits for the files already in progress.
+            logging.warning("Interrupted. Cancelling the remaining files.")
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
 
     duration = time.monotonic() - start_time
+    if html_log_entries:
+        # Workers finish in any order; list the report in file order as a sequential run would.
+        file_index = {str(path): i for i, path in enumerate(ordered_paths)}
+        html_log_entries.sort(key=lambda e: file_index.get(e.filepath, len(file_index)))
     if args.dry_run and html_log_entries:
-        changed_files_count = sum(1 for e in html_log_entries if e['status'] == 'DRY_RUN')
+        changed_files_count = sum(1 for e in html_log_entries if e.status == 'DRY_RUN')
+
+    cache_stats = response_cache_stats()
+    grammar_stats = validation_stats()
 
     if args.html_log:
-        generate_html_report(args.html_log, args.root, args.model, duration, len(final_file_list), changed_files_count, html_log_entries, system_info, args.report_title)
+        generate_html_report(args.html_log, args.root, args.model, duration, len(final_file_list), changed_files_count, html_log_entries, system_info, args.report_title, cache_stats, grammar_stats)
 
     logging.info("--- Script Finished ---")
     logging.info(f"Total processing time: {duration:.2f} seconds.")
     logging.info(f"Total files scanned: {len(final_file_list)}")
+    if cache_stats is not None:
+        logging.info(f"Ollama cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses")
+        if cache_stats["semantic_hits"] is not None:
+            logging.info(f"Semantic cache: {cache_stats['semantic_hits']} similar-page hits")
+    logging.info(f"Grammar checks: {grammar_stats['run']} run, {grammar_stats['skipped']} skipped")
     if args.dry_run:
         logging.info(f"Files that would be changed: {changed_files_count}")
     else: